@@ -17,7 +17,8 @@
 
 
 from flask import Flask, request
-from queue import Queue
+from flask_compress import Compress
+from queue import SimpleQueue
 from services.webhook import send_webhook
 import threading
 import uuid
@@ -25,25 +26,33 @@ import os
 import time
 import json
 from version import BUILD_NUMBER  # Import the BUILD_NUMBER
-from app_utils import log_job_status, discover_and_register_blueprints  # Import the discover_and_register_blueprints function
+from app_utils import log_job_status, discover_and_register_blueprints, OrjsonProvider, RouteResult  # Import the discover_and_register_blueprints function
 from services.gcp_toolkit import trigger_cloud_run_job
 
 MAX_QUEUE_LENGTH = int(os.environ.get('MAX_QUEUE_LENGTH', 0))
+QUEUE_WORKERS = max(1, int(os.environ.get('QUEUE_WORKERS', os.cpu_count() or 1)))
 
 def create_app():
     app = Flask(__name__)
+    app.json = OrjsonProvider(app)
+
+    # Compress larger JSON/text responses (e.g. transcripts) for clients that accept it
+    app.config['COMPRESS_ALGORITHM'] = ['br', 'gzip']
+    app.config['COMPRESS_LEVEL'] = 5
+    Compress(app)
 
     # Create a queue to hold tasks
-    task_queue = Queue()
+    task_queue = SimpleQueue()
     queue_id = id(task_queue)  # Generate a single queue_id for this worker
 
     # Function to process tasks from the queue
     def process_queue():
+        pid = os.getpid()  # Get the PID of the actual processing thread
+
         while True:
-            job_id, data, task_func, queue_start_time = task_queue.get()
-            queue_time = time.time() - queue_start_time
+            job_id, data, task_func, args, kwargs, queue_start_time = task_queue.get()
             run_start_time = time.time()
-            pid = os.getpid()  # Get the PID of the actual processing thread
+            queue_time = run_start_time - queue_start_time
             
             # Log job status as running
             log_job_status(job_id, {
@@ -54,266 +63,286 @@ def create_app():
                 "response": None
             })
             
-            response = task_func()
-            run_time = time.time() - run_start_time
-            total_time = time.time() - queue_start_time
+            response = RouteResult(*task_func(job_id=job_id, data=data, *args, **kwargs))
+            end_time = time.time()
+            success = response.code == 200
 
             response_data = {
-                "endpoint": response[1],
-                "code": response[2],
+                "endpoint": response.endpoint,
+                "code": response.code,
                 "id": data.get("id"),
                 "job_id": job_id,
-                "response": response[0] if response[2] == 200 else None,
-                "message": "success" if response[2] == 200 else response[0],
+                "response": response.body if success else None,
+                "message": "success" if success else response.body,
                 "pid": pid,
                 "queue_id": queue_id,
-                "run_time": round(run_time, 3),
+                "run_time": round(end_time - run_start_time, 3),
                 "queue_time": round(queue_time, 3),
-                "total_time": round(total_time, 3),
+                "total_time": round(end_time - queue_start_time, 3),
                 "queue_length": task_queue.qsize(),
                 "build_number": BUILD_NUMBER  # Add build number to response
             }
             
-            # Log job status as done
+            # Only send webhook if webhook_url has an actual value (not an empty string)
+            webhook_url = data.get("webhook_url")
+
+            # Log job status as done; the webhook tells the client it can poll,
+            # so the status must be on disk before it is sent
             log_job_status(job_id, {
                 "job_status": "done",
                 "job_id": job_id,
                 "queue_id": queue_id,
                 "process_id": pid,
                 "response": response_data
-            })
-
-            # Only send webhook if webhook_url has an actual value (not an empty string)
-            if data.get("webhook_url") and data.get("webhook_url") != "":
-                send_webhook(data.get("webhook_url"), response_data)
+            }, wait=bool(webhook_url))
 
-            task_queue.task_done()
+            if webhook_url:
+                send_webhook(webhook_url, response_data)
 
-    # Start the queue processing in a separate thread
-    threading.Thread(target=process_queue, daemon=True).start()
+    # Start the queue processing threads, all draining the same queue
+    for _ in range(QUEUE_WORKERS):
+        threading.Thread(target=process_queue, daemon=True).start()
 
     # Decorator to add tasks to the queue or bypass it
     def queue_task(bypass_queue=False):
         def decorator(f):
-            def wrapper(*args, **kwargs):
-                job_id = str(uuid.uuid4())
-                data = request.json if request.is_json else {}
-                pid = os.getpid()  # Get PID for non-queued tasks
-                start_time = time.time()
+            # The process environment doesn't change, so resolve it once per route
+            cloud_run_job = os.environ.get("CLOUD_RUN_JOB")
+            execution_name = os.environ.get("CLOUD_RUN_EXECUTION", "gcp_job")
+            gcp_job_name = os.environ.get("GCP_JOB_NAME")
+            gcp_job_location = os.environ.get("GCP_JOB_LOCATION", "us-central1")
+
+            def run_in_cloud_run_job(job_id, data, pid, start_time, args, kwargs):
+                # Inside a GCP Cloud Run Job instance, execute synchronously
+                # Log job status as running
+                log_job_status(job_id, {
+                    "job_status": "running",
+                    "job_id": job_id,
+                    "queue_id": execution_name,
+                    "process_id": pid,
+                    "response": None
+                })
+
+                # Execute the function directly (no queue)
+                response = RouteResult(*f(job_id=job_id, data=data, *args, **kwargs))
+                run_time = time.time() - start_time
+
+                # Build response object
+                response_obj = {
+                    "endpoint": response.endpoint,
+                    "code": response.code,
+                    "id": data.get("id"),
+                    "job_id": job_id,
+                    "response": response.body if response.code == 200 else None,
+                    "message": "success" if response.code == 200 else response.body,
+                    "run_time": round(run_time, 3),
+                    "queue_time": 0,
+                    "total_time": round(run_time, 3),
+                    "pid": pid,
+                    "queue_id": execution_name,
+                    "queue_length": 0,
+                    "build_number": BUILD_NUMBER
+                }
+
+                # Log job status as done
+                log_job_status(job_id, {
+                    "job_status": "done",
+                    "job_id": job_id,
+                    "queue_id": execution_name,
+                    "process_id": pid,
+                    "response": response_obj
+                }, wait=True)
+
+                # Send webhook if webhook_url is provided
+                if data.get("webhook_url") and data.get("webhook_url") != "":
+                    send_webhook(data.get("webhook_url"), response_obj)
+
+                return response_obj, response.code
+
+            def submit_gcp_job(job_id, data, pid):
+                try:
+                    overrides = {
+                        'container_overrides': [
+                            {
+                                'env': [
+                                    # Environment variables to pass to the GCP Cloud Run Job
+                                    {
+                                        'name': 'GCP_JOB_PATH',
+                                        'value': request.path  # Endpoint to call
+                                    },
+                                    {
+                                        'name': 'GCP_JOB_PAYLOAD',
+                                        'value': json.dumps(data)  # Payload as a string
+                                    },
+                                ]
+                            }
+                        ],
+                        'task_count': 1
+                    }
 
-                # If running inside a GCP Cloud Run Job instance, execute synchronously
-                if os.environ.get("CLOUD_RUN_JOB"):
-                    # Get execution name from Google's env var
-                    execution_name = os.environ.get("CLOUD_RUN_EXECUTION", "gcp_job")
+                    # Call trigger_cloud_run_job with the overrides dictionary
+                    response = trigger_cloud_run_job(
+                        job_name=gcp_job_name,
+                        location=gcp_job_location,
+                        overrides=overrides  # Pass overrides to the job
+                    )
 
-                    # Log job status as running
-                    log_job_status(job_id, {
-                        "job_status": "running",
-                        "job_id": job_id,
-                        "queue_id": execution_name,
-                        "process_id": pid,
-                        "response": None
-                    })
+                    if not response.get("job_submitted"):
+                        raise Exception(f"GCP job trigger failed: {response}")
 
-                    # Execute the function directly (no queue)
-                    response = f(job_id=job_id, data=data, *args, **kwargs)
-                    run_time = time.time() - start_time
+                    # Extract execution name and short ID for tracking
+                    execution_name = response.get("execution_name", "")
+                    gcp_queue_id = execution_name.split('/')[-1] if execution_name else "gcp_job"
 
-                    # Build response object
+                    # Prepare the response object
                     response_obj = {
-                        "endpoint": response[1],
-                        "code": response[2],
+                        "code": 200,
                         "id": data.get("id"),
                         "job_id": job_id,
-                        "response": response[0] if response[2] == 200 else None,
-                        "message": "success" if response[2] == 200 else response[0],
-                        "run_time": round(run_time, 3),
-                        "queue_time": 0,
-                        "total_time": round(run_time, 3),
+                        "message": response,
+                        "job_name": gcp_job_name,
+                        "location": gcp_job_location,
                         "pid": pid,
-                        "queue_id": execution_name,
-                        "queue_length": 0,
+                        "queue_id": gcp_queue_id,
                         "build_number": BUILD_NUMBER
                     }
-
-                    # Log job status as done
                     log_job_status(job_id, {
-                        "job_status": "done",
+                        "job_status": "submitted",
                         "job_id": job_id,
-                        "queue_id": execution_name,
+                        "queue_id": gcp_queue_id,
                         "process_id": pid,
                         "response": response_obj
-                    })
-
-                    # Send webhook if webhook_url is provided
-                    if data.get("webhook_url") and data.get("webhook_url") != "":
-                        send_webhook(data.get("webhook_url"), response_obj)
-
-                    return response_obj, response[2]
-
-                if os.environ.get("GCP_JOB_NAME") and data.get("webhook_url"):
-                    try:
-                        overrides = {
-                            'container_overrides': [
-                                {
-                                    'env': [
-                                        # Environment variables to pass to the GCP Cloud Run Job
-                                        {
-                                            'name': 'GCP_JOB_PATH',
-                                            'value': request.path  # Endpoint to call
-                                        },
-                                        {
-                                            'name': 'GCP_JOB_PAYLOAD',
-                                            'value': json.dumps(data)  # Payload as a string
-                                        },
-                                    ]
-                                }
-                            ],
-                            'task_count': 1
-                        }
-
-                        # Call trigger_cloud_run_job with the overrides dictionary
-                        response = trigger_cloud_run_job(
-                            job_name=os.environ.get("GCP_JOB_NAME"),
-                            location=os.environ.get("GCP_JOB_LOCATION", "us-central1"),
-                            overrides=overrides  # Pass overrides to the job
-                        )
-
-                        if not response.get("job_submitted"):
-                            raise Exception(f"GCP job trigger failed: {response}")
-
-                        # Extract execution name and short ID for tracking
-                        execution_name = response.get("execution_name", "")
-                        gcp_queue_id = execution_name.split('/')[-1] if execution_name else "gcp_job"
-
-                        # Prepare the response object
-                        response_obj = {
-                            "code": 200,
-                            "id": data.get("id"),
-                            "job_id": job_id,
-                            "message": response,
-                            "job_name": os.environ.get("GCP_JOB_NAME"),
-                            "location": os.environ.get("GCP_JOB_LOCATION", "us-central1"),
-                            "pid": pid,
-                            "queue_id": gcp_queue_id,
-                            "build_number": BUILD_NUMBER
-                        }
-                        log_job_status(job_id, {
-                            "job_status": "submitted",
-                            "job_id": job_id,
-                            "queue_id": gcp_queue_id,
-                            "process_id": pid,
-                            "response": response_obj
-                        })
-                        return response_obj, 200  # Return 200 since it's a submission success
-
-                    except Exception as e:
-                        error_response = {
-                            "code": 500,
-                            "id": data.get("id"),
-                            "job_id": job_id,
-                            "message": f"GCP Cloud Run Job trigger failed: {str(e)}",
-                            "job_name": os.environ.get("GCP_JOB_NAME"),
-                            "location": os.environ.get("GCP_JOB_LOCATION", "us-central1"),
-                            "pid": pid,
-                            "queue_id": "gcp_job",
-                            "build_number": BUILD_NUMBER
-                        }
-                        log_job_status(job_id, {
-                            "job_status": "failed",
-                            "job_id": job_id,
-                            "queue_id": "gcp_job",
-                            "process_id": pid,
-                            "response": error_response
-                        })
-                        return error_response, 500
-
-                elif bypass_queue or 'webhook_url' not in data:
-                    
-                    # Log job status as running immediately (bypassing queue)
+                    }, wait=True)
+                    return response_obj, 200  # Return 200 since it's a submission success
+
+                except Exception as e:
+                    error_response = {
+                        "code": 500,
+                        "id": data.get("id"),
+                        "job_id": job_id,
+                        "message": f"GCP Cloud Run Job trigger failed: {str(e)}",
+                        "job_name": gcp_job_name,
+                        "location": gcp_job_location,
+                        "pid": pid,
+                        "queue_id": "gcp_job",
+                        "build_number": BUILD_NUMBER
+                    }
                     log_job_status(job_id, {
-                        "job_status": "running",
+                        "job_status": "failed",
                         "job_id": job_id,
-                        "queue_id": queue_id,
+                        "queue_id": "gcp_job",
                         "process_id": pid,
-                        "response": None
-                    })
-                    
-                    response = f(job_id=job_id, data=data, *args, **kwargs)
-                    run_time = time.time() - start_time
-
-                    response_obj = {
-                        "endpoint": response[1],
-                        "code": response[2],
+                        "response": error_response
+                    }, wait=True)
+                    return error_response, 500
+
+            def run_now(job_id, data, pid, start_time, args, kwargs):
+                # Log job status as running immediately (bypassing queue)
+                log_job_status(job_id, {
+                    "job_status": "running",
+                    "job_id": job_id,
+                    "queue_id": queue_id,
+                    "process_id": pid,
+                    "response": None
+                })
+                
+                response = RouteResult(*f(job_id=job_id, data=data, *args, **kwargs))
+                run_time = time.time() - start_time
+
+                response_obj = {
+                    "endpoint": response.endpoint,
+                    "code": response.code,
+                    "id": data.get("id"),
+                    "job_id": job_id,
+                    "response": response.body if response.code == 200 else None,
+                    "message": "success" if response.code == 200 else response.body,
+                    "run_time": round(run_time, 3),
+                    "queue_time": 0,
+                    "total_time": round(run_time, 3),
+                    "pid": pid,
+                    "queue_id": queue_id,
+                    "queue_length": task_queue.qsize(),
+                    "build_number": BUILD_NUMBER  # Add build number to response
+                }
+                
+                # Log job status as done
+                log_job_status(job_id, {
+                    "job_status": "done",
+                    "job_id": job_id,
+                    "queue_id": queue_id,
+                    "process_id": pid,
+                    "response": response_obj
+                }, wait=True)
+                
+                return response_obj, response.code
+
+            def enqueue(job_id, data, pid, start_time, args, kwargs):
+                if MAX_QUEUE_LENGTH > 0 and task_queue.qsize() >= MAX_QUEUE_LENGTH:
+                    error_response = {
+                        "code": 429,
                         "id": data.get("id"),
                         "job_id": job_id,
-                        "response": response[0] if response[2] == 200 else None,
-                        "message": "success" if response[2] == 200 else response[0],
-                        "run_time": round(run_time, 3),
-                        "queue_time": 0,
-                        "total_time": round(run_time, 3),
+                        "message": f"MAX_QUEUE_LENGTH ({MAX_QUEUE_LENGTH}) reached",
                         "pid": pid,
                         "queue_id": queue_id,
                         "queue_length": task_queue.qsize(),
                         "build_number": BUILD_NUMBER  # Add build number to response
                     }
                     
-                    # Log job status as done
+                    # Log the queue overflow error
                     log_job_status(job_id, {
                         "job_status": "done",
                         "job_id": job_id,
                         "queue_id": queue_id,
                         "process_id": pid,
-                        "response": response_obj
-                    })
-                    
-                    return response_obj, response[2]
-                else:
-                    if MAX_QUEUE_LENGTH > 0 and task_queue.qsize() >= MAX_QUEUE_LENGTH:
-                        error_response = {
-                            "code": 429,
-                            "id": data.get("id"),
-                            "job_id": job_id,
-                            "message": f"MAX_QUEUE_LENGTH ({MAX_QUEUE_LENGTH}) reached",
-                            "pid": pid,
-                            "queue_id": queue_id,
-                            "queue_length": task_queue.qsize(),
-                            "build_number": BUILD_NUMBER  # Add build number to response
-                        }
-                        
-                        # Log the queue overflow error
-                        log_job_status(job_id, {
-                            "job_status": "done",
-                            "job_id": job_id,
-                            "queue_id": queue_id,
-                            "process_id": pid,
-                            "response": error_response
-                        })
-                        
-                        return error_response, 429
+                        "response": error_response
+                    }, wait=True)
                     
-                    # Log job status as queued
-                    log_job_status(job_id, {
-                        "job_status": "queued",
-                        "job_id": job_id,
-                        "queue_id": queue_id,
-                        "process_id": pid,
-                        "response": None
-                    })
-                    
-                    task_queue.put((job_id, data, lambda: f(job_id=job_id, data=data, *args, **kwargs), start_time))
-                    
-                    return {
-                        "code": 202,
-                        "id": data.get("id"),
-                        "job_id": job_id,
-                        "message": "processing",
-                        "pid": pid,
-                        "queue_id": queue_id,
-                        "max_queue_length": MAX_QUEUE_LENGTH if MAX_QUEUE_LENGTH > 0 else "unlimited",
-                        "queue_length": task_queue.qsize(),
-                        "build_number": BUILD_NUMBER  # Add build number to response
-                    }, 202
+                    return error_response, 429
+                
+                # Log job status as queued
+                log_job_status(job_id, {
+                    "job_status": "queued",
+                    "job_id": job_id,
+                    "queue_id": queue_id,
+                    "process_id": pid,
+                    "response": None
+                }, wait=True)
+                
+                task_queue.put((job_id, data, f, args, kwargs, start_time))
+                
+                return {
+                    "code": 202,
+                    "id": data.get("id"),
+                    "job_id": job_id,
+                    "message": "processing",
+                    "pid": pid,
+                    "queue_id": queue_id,
+                    "max_queue_length": MAX_QUEUE_LENGTH if MAX_QUEUE_LENGTH > 0 else "unlimited",
+                    "queue_length": task_queue.qsize(),
+                    "build_number": BUILD_NUMBER  # Add build number to response
+                }, 202
+
+            def run_or_enqueue(job_id, data, pid, start_time, args, kwargs):
+                if 'webhook_url' not in data:
+                    return run_now(job_id, data, pid, start_time, args, kwargs)
+                return enqueue(job_id, data, pid, start_time, args, kwargs)
+
+            # Routes that bypass the queue always run synchronously, so pick the
+            # local runner now instead of checking on every request
+            run_local = run_now if bypass_queue else run_or_enqueue
+
+            def wrapper(*args, **kwargs):
+                job_id = str(uuid.uuid4())
+                data = request.json if request.is_json else {}
+                pid = os.getpid()  # Get PID for non-queued tasks
+                start_time = time.time()
+
+                if cloud_run_job:
+                    return run_in_cloud_run_job(job_id, data, pid, start_time, args, kwargs)
+                if gcp_job_name and data.get("webhook_url"):
+                    return submit_gcp_job(job_id, data, pid)
+                return run_local(job_id, data, pid, start_time, args, kwargs)
             return wrapper
         return decorator
 
@@ -19,17 +19,15 @@
 from flask import Blueprint, request, jsonify, current_app
 from app_utils import *
 from functools import wraps
-import os
+from services.authentication import is_valid_api_key
 
 auth_bp = Blueprint('auth', __name__)
 
-API_KEY = os.environ.get('API_KEY')
-
 @auth_bp.route('/authenticate', methods=['GET'])
 @queue_task_wrapper(bypass_queue=True)
 def authenticate_endpoint(**kwargs):
     api_key = request.headers.get('X-API-Key')
-    if api_key == API_KEY:
+    if is_valid_api_key(api_key):
         return "Authorized", "/authenticate", 200
     else:
         return "Unauthorized", "/authenticate", 401
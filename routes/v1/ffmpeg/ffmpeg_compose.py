@@ -18,6 +18,7 @@
 
 import os
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from flask import Blueprint, request, jsonify
 from app_utils import *
 from services.v1.ffmpeg.ffmpeg_compose import process_ffmpeg_compose
@@ -27,6 +28,9 @@ from services.cloud_storage import upload_file
 v1_ffmpeg_compose_bp = Blueprint('v1_ffmpeg_compose', __name__)
 logger = logging.getLogger(__name__)
 
+# Shared pool for uploading outputs and thumbnails concurrently
+upload_executor = ThreadPoolExecutor(max_workers=4)
+
 @v1_ffmpeg_compose_bp.route('/v1/ffmpeg/compose', methods=['POST'])
 @authenticate
 @validate_payload({
@@ -119,29 +123,41 @@ def ffmpeg_api(job_id, data):
     try:
         output_filenames, metadata = process_ffmpeg_compose(data, job_id)
         
-        # Upload output files to GCP and create result array
-        output_urls = []
-        for i, output_filename in enumerate(output_filenames):
-            if os.path.exists(output_filename):
-                upload_url = upload_file(output_filename)
-                output_info = {"file_url": upload_url}
-                
-                if metadata and i < len(metadata):
-                    output_metadata = metadata[i]
-                    if 'thumbnail' in output_metadata:
-                        thumbnail_path = output_metadata['thumbnail']
-                        if os.path.exists(thumbnail_path):
-                            thumbnail_url = upload_file(thumbnail_path)
-                            del output_metadata['thumbnail']
-                            output_metadata['thumbnail_url'] = thumbnail_url
-                            os.remove(thumbnail_path)  # Clean up local thumbnail file
-                    output_info.update(output_metadata)
-                
-                output_urls.append(output_info)
-                os.remove(output_filename)  # Clean up local output file after upload
-            else:
+        # Check every output before starting any upload, so a missing one
+        # doesn't leave earlier uploads running with no one to clean up
+        for output_filename in output_filenames:
+            if not os.path.exists(output_filename):
                 raise Exception(f"Expected output file {output_filename} not found")
 
+        # Start uploading every output file and thumbnail at once
+        uploads = []
+        for i, output_filename in enumerate(output_filenames):
+            thumbnail_path = None
+            if metadata and i < len(metadata) and 'thumbnail' in metadata[i]:
+                if os.path.exists(metadata[i]['thumbnail']):
+                    thumbnail_path = metadata[i]['thumbnail']
+
+            uploads.append((
+                upload_executor.submit(upload_file, output_filename),
+                upload_executor.submit(upload_file, thumbnail_path) if thumbnail_path else None
+            ))
+
+        # Collect the results in output order
+        output_urls = []
+        for i, (output_future, thumbnail_future) in enumerate(uploads):
+            output_info = {"file_url": output_future.result()}
+
+            if metadata and i < len(metadata):
+                output_metadata = metadata[i]
+                if thumbnail_future:
+                    thumbnail_path = output_metadata.pop('thumbnail')
+                    output_metadata['thumbnail_url'] = thumbnail_future.result()
+                    os.remove(thumbnail_path)  # Clean up local thumbnail file
+                output_info.update(output_metadata)
+
+            output_urls.append(output_info)
+            os.remove(output_filenames[i])  # Clean up local output file after upload
+
         return output_urls, "/v1/ffmpeg/compose", 200
         
     except Exception as e:
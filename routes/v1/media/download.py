@@ -6,15 +6,55 @@ import yt_dlp
 import tempfile
 from werkzeug.utils import secure_filename
 import uuid
-from services.cloud_storage import upload_file
+from services.cloud_storage import upload_file, upload_file_stream
 from services.authentication import authenticate
-from services.file_management import download_file
+from services.file_management import download_file, open_url_stream
 from urllib.parse import quote, urlparse
 import requests
+from concurrent.futures import ThreadPoolExecutor
 
 v1_media_download_bp = Blueprint('v1_media_download', __name__)
 logger = logging.getLogger(__name__)
 
+# Format options joined, in this order, into the yt-dlp format selector
+FORMAT_FIELDS = ('quality', 'format_id', 'resolution', 'video_codec', 'audio_codec')
+
+# (request option group, request key, yt-dlp option) copied over when set;
+# later entries win, so subtitle languages override thumbnail formats
+YDL_OPTION_MAP = (
+    ('audio', 'format', 'audio_format'),
+    ('audio', 'quality', 'audio_quality'),
+    ('thumbnails', 'formats', 'subtitleslangs'),
+    ('subtitles', 'languages', 'subtitleslangs'),
+    ('subtitles', 'format', 'subtitlesformat'),
+    ('download', 'max_filesize', 'max_filesize'),
+    ('download', 'rate_limit', 'limit_rate'),
+    ('download', 'retries', 'retries'),
+)
+
+# Shared pool for fetching and re-uploading thumbnails concurrently
+thumbnail_executor = ThreadPoolExecutor(max_workers=8)
+
+def process_thumbnail(thumbnail):
+    """Stream a thumbnail into cloud storage and describe the result."""
+    try:
+        # Pipe the download straight into the upload, skipping the local disk
+        filename, stream, content_type = open_url_stream(thumbnail['url'])
+        with stream:
+            thumbnail_url = upload_file_stream(stream, filename, content_type)
+
+        return {
+            "id": thumbnail.get('id', 'default'),
+            "image_url": thumbnail_url,
+            "width": thumbnail.get('width'),
+            "height": thumbnail.get('height'),
+            "original_format": thumbnail.get('ext'),
+            "converted": thumbnail.get('converted', False)
+        }
+    except Exception as e:
+        logger.error(f"Error processing thumbnail: {str(e)}")
+        return None
+
 @v1_media_download_bp.route('/v1/BETA/media/download', methods=['POST'])
 @authenticate
 @validate_payload({
@@ -74,7 +114,8 @@ logger = logging.getLogger(__name__)
             "properties": {
                 "max_filesize": {"type": "integer"},
                 "rate_limit": {"type": "string"},
-                "retries": {"type": "integer"}
+                "retries": {"type": "integer"},
+                "concurrent_fragments": {"type": "integer", "minimum": 1, "maximum": 16}
             }
         }
     },
@@ -103,7 +144,9 @@ def download_media(job_id, data):
                 'outtmpl': os.path.join(temp_dir, '%(title)s.%(ext)s'),
                 'quiet': True,
                 'no_warnings': True,
-                'download': data.get('cloud_upload', True)
+                'download': data.get('cloud_upload', True),
+                # Fetch HLS/DASH fragments in parallel (yt-dlp's -N)
+                'concurrent_fragment_downloads': download_options.get('concurrent_fragments', 4)
             }
 
             # Add cookies if provided
@@ -120,56 +163,33 @@ def download_media(job_id, data):
                         f.write(cookie)
                     ydl_opts['cookiefile'] = cookie_file
 
-            # Add format options if specified
-            if format_options:
-                format_str = []
-                if format_options.get('quality'):
-                    format_str.append(format_options['quality'])
-                if format_options.get('format_id'):
-                    format_str.append(format_options['format_id'])
-                if format_options.get('resolution'):
-                    format_str.append(format_options['resolution'])
-                if format_options.get('video_codec'):
-                    format_str.append(format_options['video_codec'])
-                if format_options.get('audio_codec'):
-                    format_str.append(format_options['audio_codec'])
-                if format_str:
-                    ydl_opts['format'] = '+'.join(format_str)
-
-            # Add audio options if specified
-            if audio_options:
-                if audio_options.get('extract'):
-                    ydl_opts['extract_audio'] = True
-                    if audio_options.get('format'):
-                        ydl_opts['audio_format'] = audio_options['format']
-                    if audio_options.get('quality'):
-                        ydl_opts['audio_quality'] = audio_options['quality']
+            # Build the format selector from whichever format options were given
+            format_str = '+'.join(filter(None, (format_options.get(key) for key in FORMAT_FIELDS)))
+            if format_str:
+                ydl_opts['format'] = format_str
 
-            # Add thumbnail options if specified
+            # Flags that are set whenever their option group is present
+            if audio_options.get('extract'):
+                ydl_opts['extract_audio'] = True
             if thumbnail_options:
                 ydl_opts['writesubtitles'] = thumbnail_options.get('download', False)
                 ydl_opts['writeallsubtitles'] = thumbnail_options.get('download_all', False)
-                if thumbnail_options.get('formats'):
-                    ydl_opts['subtitleslangs'] = thumbnail_options['formats']
                 ydl_opts['convert_thumbnails'] = thumbnail_options.get('convert', False)
                 ydl_opts['embed_thumbnail_in_audio'] = thumbnail_options.get('embed_in_audio', False)
-
-            # Add subtitle options if specified
             if subtitle_options:
                 ydl_opts['writesubtitles'] = subtitle_options.get('download', False)
-                if subtitle_options.get('languages'):
-                    ydl_opts['subtitleslangs'] = subtitle_options['languages']
-                if subtitle_options.get('format'):
-                    ydl_opts['subtitlesformat'] = subtitle_options['format']
 
-            # Add download options if specified
-            if download_options:
-                if download_options.get('max_filesize'):
-                    ydl_opts['max_filesize'] = download_options['max_filesize']
-                if download_options.get('rate_limit'):
-                    ydl_opts['limit_rate'] = download_options['rate_limit']
-                if download_options.get('retries'):
-                    ydl_opts['retries'] = download_options['retries']
+            # Copy the remaining options across in a single pass
+            option_groups = {
+                'audio': audio_options if audio_options.get('extract') else {},
+                'thumbnails': thumbnail_options,
+                'subtitles': subtitle_options,
+                'download': download_options
+            }
+            for group, key, ydl_key in YDL_OPTION_MAP:
+                value = option_groups[group].get(key)
+                if value:
+                    ydl_opts[ydl_key] = value
 
             # Download the media
             with yt_dlp.YoutubeDL(ydl_opts) as ydl:
@@ -179,10 +199,8 @@ def download_media(job_id, data):
                     media_url = info['url']
                 else:
                     filename = ydl.prepare_filename(info)
-                    # Upload to cloud storage
+                    # Upload to cloud storage; the temporary directory cleans up the file
                     media_url = upload_file(filename)
-                    # Clean up the temporary file
-                    os.remove(filename)
 
                 # Prepare response
                 response = {
@@ -209,28 +227,10 @@ def download_media(job_id, data):
 
                 # Add thumbnails if available and requested
                 if info.get('thumbnails') and thumbnail_options.get('download', False):
-                    response["thumbnails"] = []
-                    for thumbnail in info['thumbnails']:
-                        if thumbnail.get('url'):
-                            try:
-                                # Download the thumbnail first
-                                thumbnail_path = download_file(thumbnail['url'], temp_dir)
-                                # Upload to cloud storage
-                                thumbnail_url = upload_file(thumbnail_path)
-                                # Clean up the temporary thumbnail file
-                                os.remove(thumbnail_path)
-                                
-                                response["thumbnails"].append({
-                                    "id": thumbnail.get('id', 'default'),
-                                    "image_url": thumbnail_url,
-                                    "width": thumbnail.get('width'),
-                                    "height": thumbnail.get('height'),
-                                    "original_format": thumbnail.get('ext'),
-                                    "converted": thumbnail.get('converted', False)
-                                })
-                            except Exception as e:
-                                logger.error(f"Error processing thumbnail: {str(e)}")
-                                continue
+                    thumbnails = [thumbnail for thumbnail in info['thumbnails'] if thumbnail.get('url')]
+                    # Thumbnails are independent, so fetch them in parallel; map keeps their order
+                    results = thumbnail_executor.map(process_thumbnail, thumbnails)
+                    response["thumbnails"] = [result for result in results if result]
 
                 # Process subtitles if available
                 if 'subtitles' in info and subtitle_options.get('download', False):
@@ -20,6 +20,7 @@ from flask import Blueprint
 from app_utils import *
 import logging
 import os
+from concurrent.futures import ThreadPoolExecutor
 from services.v1.media.media_transcribe import process_transcribe_media
 from services.authentication import authenticate
 from services.cloud_storage import upload_file
@@ -27,6 +28,9 @@ from services.cloud_storage import upload_file
 v1_media_transcribe_bp = Blueprint('v1_media_transcribe', __name__)
 logger = logging.getLogger(__name__)
 
+# Shared pool for uploading the text, srt and segments files concurrently
+upload_executor = ThreadPoolExecutor(max_workers=3)
+
 @v1_media_transcribe_bp.route('/v1/media/transcribe', methods=['POST'])
 @authenticate
 @validate_payload({
@@ -83,23 +87,28 @@ def transcribe(job_id, data):
 
         else:
 
+            outputs = {
+                "text_url": (include_text, result[0]),
+                "srt_url": (include_srt, result[1]),
+                "segments_url": (include_segments, result[2]),
+            }
+
+            # Start all requested uploads at once
+            uploads = {
+                key: upload_executor.submit(upload_file, path)
+                for key, (included, path) in outputs.items() if included is True
+            }
+
             cloud_urls = {
                 "text": None,
                 "srt": None,
                 "segments": None,
-                "text_url": upload_file(result[0]) if include_text is True else None,
-                "srt_url": upload_file(result[1]) if include_srt is True else None,
-                "segments_url": upload_file(result[2]) if include_segments is True else None,
             }
+            for key in outputs:
+                cloud_urls[key] = uploads[key].result() if key in uploads else None
 
-            if include_text is True:
-                os.remove(result[0])  # Remove the temporary file after uploading
-            
-            if include_srt is True:
-                os.remove(result[1])
-
-            if include_segments is True:
-                os.remove(result[2])
+            for key in uploads:
+                os.remove(outputs[key][1])  # Remove the temporary file after uploading
             
             return cloud_urls, "/v1/transcribe/media", 200
 
@@ -20,11 +20,11 @@ import os
 import ffmpeg
 import logging
 import subprocess
-import whisper
 from datetime import timedelta
 import srt
 import re
 from services.file_management import download_file
+from services.whisper_models import acquire_whisper_model, release_whisper_model
 from services.cloud_storage import upload_file  # Ensure this import is present
 import requests  # Ensure requests is imported for webhook handling
 from urllib.parse import urlparse
@@ -64,14 +64,17 @@ def rgb_to_ass_color(rgb_color):
 
 def generate_transcription(video_path, language='auto'):
     try:
-        model = whisper.load_model("base")
         transcription_options = {
             'word_timestamps': True,
             'verbose': True,
         }
         if language != 'auto':
             transcription_options['language'] = language
-        result = model.transcribe(video_path, **transcription_options)
+        model = acquire_whisper_model("base")
+        try:
+            result = model.transcribe(video_path, **transcription_options)
+        finally:
+            release_whisper_model(model, "base")
         logger.info(f"Transcription generated successfully for video: {video_path}")
         return result
     except Exception as e:
@@ -115,10 +118,10 @@ def get_available_fonts():
 
 def format_ass_time(seconds):
     """Convert float seconds to ASS time format H:MM:SS.cc"""
-    hours = int(seconds // 3600)
-    minutes = int((seconds % 3600) // 60)
-    secs = int(seconds % 60)
-    centiseconds = int(round((seconds - int(seconds)) * 100))
+    whole_seconds = int(seconds)
+    minutes, secs = divmod(whole_seconds, 60)
+    hours, minutes = divmod(minutes, 60)
+    centiseconds = int(round((seconds - whole_seconds) * 100))
     return f"{hours}:{minutes:02}:{secs:02}.{centiseconds:02}"
 
 def process_subtitle_text(text, replace_dict, all_caps, max_words_per_line):
@@ -16,16 +16,28 @@
 
 
 
+import hashlib
+import hmac
 from functools import wraps
 from flask import request, jsonify
 from config import API_KEY
 
+# Keys are compared as fixed-length digests so the check takes the same time
+# no matter how much of a guessed key is correct
+API_KEY_DIGEST = hashlib.sha256(API_KEY.encode()).digest()
+
+def is_valid_api_key(api_key):
+    """Check a presented API key against API_KEY in constant time."""
+    if api_key is None:
+        return False
+    return hmac.compare_digest(hashlib.sha256(api_key.encode()).digest(), API_KEY_DIGEST)
+
 def authenticate(func):
     @wraps(func)
     def wrapper(*args, **kwargs):
         api_key = request.headers.get('X-API-Key')
         
-        if api_key != API_KEY:
+        if not is_valid_api_key(api_key):
             return jsonify({"message": "Unauthorized"}), 401
         return func(*args, **kwargs)
     return wrapper
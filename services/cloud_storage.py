@@ -19,8 +19,8 @@
 import os
 import logging
 from abc import ABC, abstractmethod
-from services.gcp_toolkit import upload_to_gcs
-from services.s3_toolkit import upload_to_s3
+from services.gcp_toolkit import upload_to_gcs, upload_fileobj_to_gcs
+from services.s3_toolkit import upload_to_s3, upload_fileobj_to_s3
 from config import validate_env_vars
 from urllib.parse import urlparse
 
@@ -43,6 +43,10 @@ class CloudStorageProvider(ABC):
     def upload_file(self, file_path: str) -> str:
         pass
 
+    @abstractmethod
+    def upload_fileobj(self, fileobj, filename: str, content_type: str = None) -> str:
+        pass
+
 class GCPStorageProvider(CloudStorageProvider):
     def __init__(self):
         self.bucket_name = os.getenv('GCP_BUCKET_NAME')
@@ -50,6 +54,9 @@ class GCPStorageProvider(CloudStorageProvider):
     def upload_file(self, file_path: str) -> str:
         return upload_to_gcs(file_path, self.bucket_name)
 
+    def upload_fileobj(self, fileobj, filename: str, content_type: str = None) -> str:
+        return upload_fileobj_to_gcs(fileobj, filename, self.bucket_name, content_type)
+
 class S3CompatibleProvider(CloudStorageProvider):
     def __init__(self):
 
@@ -86,6 +93,9 @@ class S3CompatibleProvider(CloudStorageProvider):
     def upload_file(self, file_path: str) -> str:
         return upload_to_s3(file_path, self.endpoint_url, self.access_key, self.secret_key, self.bucket_name, self.region)
 
+    def upload_fileobj(self, fileobj, filename: str, content_type: str = None) -> str:
+        return upload_fileobj_to_s3(fileobj, filename, self.endpoint_url, self.access_key, self.secret_key, self.bucket_name, self.region, content_type)
+
 def get_storage_provider() -> CloudStorageProvider:
     
     if os.getenv('S3_ENDPOINT_URL'):
@@ -115,4 +125,15 @@ def upload_file(file_path: str) -> str:
     except Exception as e:
         logger.error(f"Error uploading file to cloud storage: {e}")
         raise
-    
\ No newline at end of file
+
+def upload_file_stream(fileobj, filename: str, content_type: str = None) -> str:
+    """Upload a readable file-like object straight to cloud storage, without a local copy."""
+    provider = get_storage_provider()
+    try:
+        logger.info(f"Streaming upload to cloud storage: {filename}")
+        url = provider.upload_fileobj(fileobj, filename, content_type)
+        logger.info(f"File uploaded successfully: {url}")
+        return url
+    except Exception as e:
+        logger.error(f"Error uploading stream to cloud storage: {e}")
+        raise
@@ -19,9 +19,18 @@
 import os
 import uuid
 import requests
+import http.cookiejar
+from requests.adapters import HTTPAdapter
 from urllib.parse import urlparse, parse_qs
 import mimetypes
 
+# Shared session so repeated downloads from the same host reuse keep-alive connections
+session = requests.Session()
+session.mount('http://', HTTPAdapter(pool_connections=16, pool_maxsize=64))
+session.mount('https://', HTTPAdapter(pool_connections=16, pool_maxsize=64))
+# Don't carry cookies set by one job's URL over to another job's requests
+session.cookies.set_policy(http.cookiejar.DefaultCookiePolicy(allowed_domains=[]))
+
 def get_extension_from_url(url):
     """Extract file extension from URL or content type.
     
@@ -44,7 +53,7 @@ def get_extension_from_url(url):
 
     # If no extension in URL, try to determine from content type
     try:
-        response = requests.head(url, allow_redirects=True)
+        response = session.head(url, allow_redirects=True)
         content_type = response.headers.get('content-type', '').split(';')[0]
         ext = mimetypes.guess_extension(content_type)
         if ext:
@@ -55,6 +64,35 @@ def get_extension_from_url(url):
     # If we can't determine the extension, raise an error
     raise ValueError(f"Could not determine file extension from URL: {url}")
 
+def remove_file(path):
+    """Delete a local file, ignoring it if it does not exist. Return whether it was deleted."""
+    try:
+        os.remove(path)
+        return True
+    except FileNotFoundError:
+        return False
+
+def open_url_stream(url):
+    """Open a URL for streaming and return (filename, file-like body, content type).
+
+    The filename is a fresh UUID with the extension inferred from the URL, matching
+    what download_file would write to disk. The content type is taken from the
+    response, falling back to a guess from the filename. The caller must close the
+    returned stream.
+    """
+    filename = f"{uuid.uuid4()}{get_extension_from_url(url)}"
+
+    response = session.get(url, stream=True)
+    try:
+        response.raise_for_status()
+    except Exception:
+        response.close()
+        raise
+    # Let urllib3 undo any gzip/deflate transfer encoding while reading
+    response.raw.decode_content = True
+    content_type = response.headers.get('Content-Type') or mimetypes.guess_type(filename)[0]
+    return filename, response.raw, content_type
+
 def download_file(url, storage_path="/tmp/"):
     """Download a file from URL to local storage."""
     # Create storage directory if it doesn't exist
@@ -65,7 +103,7 @@ def download_file(url, storage_path="/tmp/"):
     local_filename = os.path.join(storage_path, f"{file_id}{extension}")
 
     try:
-        response = requests.get(url, stream=True)
+        response = session.get(url, stream=True)
         response.raise_for_status()
 
         with open(local_filename, 'wb') as f:
@@ -75,7 +113,6 @@ def download_file(url, storage_path="/tmp/"):
 
         return local_filename
     except Exception as e:
-        if os.path.exists(local_filename):
-            os.remove(local_filename)
+        remove_file(local_filename)
         raise e
 
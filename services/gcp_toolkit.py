@@ -19,6 +19,7 @@
 import os
 import json
 import logging
+import mimetypes
 from google.oauth2 import service_account
 from google.cloud import storage
 from google.cloud.run_v2 import JobsClient, RunJobRequest
@@ -72,6 +73,22 @@ def upload_to_gcs(file_path, bucket_name=GCP_BUCKET_NAME):
         logger.error(f"Error uploading file to GCS: {e}")
         raise
 
+def upload_fileobj_to_gcs(fileobj, filename, bucket_name=GCP_BUCKET_NAME, content_type=None):
+    if not gcs_client:
+        raise ValueError("GCS client is not initialized. Skipping file upload.")
+
+    try:
+        logger.info(f"Streaming upload to Google Cloud Storage: {filename}")
+        bucket = gcs_client.bucket(bucket_name)
+        blob = bucket.blob(filename)
+        # Unlike upload_from_filename, upload_from_file doesn't guess the type itself
+        blob.upload_from_file(fileobj, content_type=content_type or mimetypes.guess_type(filename)[0])
+        logger.info(f"File uploaded successfully to GCS: {blob.public_url}")
+        return blob.public_url
+    except Exception as e:
+        logger.error(f"Error uploading stream to GCS: {e}")
+        raise
+
 
 def trigger_cloud_run_job(job_name, location="us-central1", overrides=None):
     # Retrieve service account credentials
@@ -19,26 +19,60 @@
 import os
 import boto3
 import logging
+from functools import lru_cache
+from boto3.s3.transfer import TransferConfig
 from urllib.parse import urlparse, quote
 
 logger = logging.getLogger(__name__)
 
-def upload_to_s3(file_path, s3_url, access_key, secret_key, bucket_name, region):
-    # Parse the S3 URL into bucket, region, and endpoint
-    #bucket_name, region, endpoint_url = parse_s3_url(s3_url)
-    
+# Large files are split into 8MB parts and uploaded with several threads
+TRANSFER_CONFIG = TransferConfig(
+    multipart_threshold=8 * 1024 * 1024,
+    multipart_chunksize=8 * 1024 * 1024,
+    max_concurrency=8,
+    use_threads=True
+)
+
+@lru_cache(maxsize=8)
+def get_s3_client(s3_url, access_key, secret_key, region):
+    """Create an S3 client once per set of credentials and reuse it (clients are thread-safe)."""
     session = boto3.Session(
         aws_access_key_id=access_key,
         aws_secret_access_key=secret_key,
         region_name=region
     )
     
-    client = session.client('s3', endpoint_url=s3_url)
+    return session.client('s3', endpoint_url=s3_url)
+
+def upload_fileobj_to_s3(fileobj, filename, s3_url, access_key, secret_key, bucket_name, region, content_type=None):
+    """Upload a readable file-like object to S3 under the given filename."""
+    client = get_s3_client(s3_url, access_key, secret_key, region)
+
+    try:
+        # upload_fileobj reads the stream in chunks, so it never needs to be on disk
+        extra_args = {'ACL': 'public-read'}
+        if content_type:
+            extra_args['ContentType'] = content_type
+        client.upload_fileobj(fileobj, bucket_name, filename, ExtraArgs=extra_args, Config=TRANSFER_CONFIG)
+
+        # URL encode the filename for the URL
+        encoded_filename = quote(filename)
+        file_url = f"{s3_url}/{bucket_name}/{encoded_filename}"
+        return file_url
+    except Exception as e:
+        logger.error(f"Error uploading stream to S3: {e}")
+        raise
+
+def upload_to_s3(file_path, s3_url, access_key, secret_key, bucket_name, region):
+    # Parse the S3 URL into bucket, region, and endpoint
+    #bucket_name, region, endpoint_url = parse_s3_url(s3_url)
+    
+    client = get_s3_client(s3_url, access_key, secret_key, region)
 
     try:
-        # Upload the file to the specified S3 bucket
-        with open(file_path, 'rb') as data:
-            client.upload_fileobj(data, bucket_name, os.path.basename(file_path), ExtraArgs={'ACL': 'public-read'})
+        # Upload the file to the specified S3 bucket; upload_file reads parts of
+        # large files directly from disk and sends them concurrently
+        client.upload_file(file_path, bucket_name, os.path.basename(file_path), ExtraArgs={'ACL': 'public-read'}, Config=TRANSFER_CONFIG)
 
         # URL encode the filename for the URL
         encoded_filename = quote(os.path.basename(file_path))
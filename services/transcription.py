@@ -17,11 +17,11 @@
 
 
 import os
-import whisper
 import srt
 from datetime import timedelta
 from whisper.utils import WriteSRT, WriteVTT
 from services.file_management import download_file
+from services.whisper_models import acquire_whisper_model, release_whisper_model
 import logging
 import uuid
 
@@ -39,58 +39,61 @@ def process_transcription(media_url, output_type, max_chars=56, language=None,):
     logger.info(f"Downloaded media to local file: {input_filename}")
 
     try:
-        model = whisper.load_model("base")
+        model = acquire_whisper_model("base")
         logger.info("Loaded Whisper model")
 
         # result = model.transcribe(input_filename)
         # logger.info("Transcription completed")
 
-        if output_type == 'transcript':
-            result = model.transcribe(input_filename, language=language)
-            output = result['text']
-            logger.info("Generated transcript output")
-        elif output_type in ['srt', 'vtt']:
-
-            result = model.transcribe(input_filename)
-            srt_subtitles = []
-            for i, segment in enumerate(result['segments'], start=1):
-                start = timedelta(seconds=segment['start'])
-                end = timedelta(seconds=segment['end'])
-                text = segment['text'].strip()
-                srt_subtitles.append(srt.Subtitle(i, start, end, text))
+        try:
+            if output_type == 'transcript':
+                result = model.transcribe(input_filename, language=language)
+                output = result['text']
+                logger.info("Generated transcript output")
+            elif output_type in ['srt', 'vtt']:
+
+                result = model.transcribe(input_filename)
+                srt_subtitles = []
+                for i, segment in enumerate(result['segments'], start=1):
+                    start = timedelta(seconds=segment['start'])
+                    end = timedelta(seconds=segment['end'])
+                    text = segment['text'].strip()
+                    srt_subtitles.append(srt.Subtitle(i, start, end, text))
             
-            output_content = srt.compose(srt_subtitles)
+                output_content = srt.compose(srt_subtitles)
             
-            # Write the output to a file
-            output_filename = os.path.join(STORAGE_PATH, f"{uuid.uuid4()}.{output_type}")
-            with open(output_filename, 'w') as f:
-                f.write(output_content)
+                # Write the output to a file
+                output_filename = os.path.join(STORAGE_PATH, f"{uuid.uuid4()}.{output_type}")
+                with open(output_filename, 'w') as f:
+                    f.write(output_content)
             
-            output = output_filename
-            logger.info(f"Generated {output_type.upper()} output: {output}")
-
-        elif output_type == 'ass':
-            result = model.transcribe(
-                input_filename,
-                word_timestamps=True,
-                task='transcribe',
-                verbose=False
-            )
-            logger.info("Transcription completed with word-level timestamps")
-            # Generate ASS subtitle content
-            ass_content = generate_ass_subtitle(result, max_chars)
-            logger.info("Generated ASS subtitle content")
+                output = output_filename
+                logger.info(f"Generated {output_type.upper()} output: {output}")
+
+            elif output_type == 'ass':
+                result = model.transcribe(
+                    input_filename,
+                    word_timestamps=True,
+                    task='transcribe',
+                    verbose=False
+                )
+                logger.info("Transcription completed with word-level timestamps")
+                # Generate ASS subtitle content
+                ass_content = generate_ass_subtitle(result, max_chars)
+                logger.info("Generated ASS subtitle content")
             
-            output_content = ass_content
-
-            # Write the ASS content to a file
-            output_filename = os.path.join(STORAGE_PATH, f"{uuid.uuid4()}.{output_type}")
-            with open(output_filename, 'w') as f:
-               f.write(output_content) 
-            output = output_filename
-            logger.info(f"Generated {output_type.upper()} output: {output}")
-        else:
-            raise ValueError("Invalid output type. Must be 'transcript', 'srt', or 'vtt'.")
+                output_content = ass_content
+
+                # Write the ASS content to a file
+                output_filename = os.path.join(STORAGE_PATH, f"{uuid.uuid4()}.{output_type}")
+                with open(output_filename, 'w') as f:
+                   f.write(output_content) 
+                output = output_filename
+                logger.info(f"Generated {output_type.upper()} output: {output}")
+            else:
+                raise ValueError("Invalid output type. Must be 'transcript', 'srt', or 'vtt'.")
+        finally:
+            release_whisper_model(model, "base")
 
         os.remove(input_filename)
         logger.info(f"Removed local file: {input_filename}")
@@ -109,10 +112,10 @@ def generate_ass_subtitle(result, max_chars):
 
     # Helper function to format time
     def format_time(t):
-        hours = int(t // 3600)
-        minutes = int((t % 3600) // 60)
-        seconds = int(t % 60)
-        centiseconds = int(round((t - int(t)) * 100))
+        whole_seconds = int(t)
+        minutes, seconds = divmod(whole_seconds, 60)
+        hours, minutes = divmod(minutes, 60)
+        centiseconds = int(round((t - whole_seconds) * 100))
         return f"{hours}:{minutes:02d}:{seconds:02d}.{centiseconds:02d}"
 
     max_chars_per_line = max_chars  # Maximum characters per line
@@ -34,25 +34,30 @@ def process_audio_concatenate(media_urls, job_id, webhook_url=None):
             input_filename = download_file(url, os.path.join(LOCAL_STORAGE_PATH, f"{job_id}_input_{i}"))
             input_files.append(input_filename)
 
-        # Generate an absolute path concat list file for FFmpeg
-        concat_file_path = os.path.join(LOCAL_STORAGE_PATH, f"{job_id}_concat_list.txt")
-        with open(concat_file_path, 'w') as concat_file:
-            for input_file in input_files:
-                # Write absolute paths to the concat list
-                concat_file.write(f"file '{os.path.abspath(input_file)}'\n")
+        if len(input_files) == 1 and os.path.splitext(input_files[0])[1].lower() == '.mp3':
+            # A single input already in the output format has nothing to join;
+            # move it into place instead of running FFmpeg over it
+            os.replace(input_files[0], output_path)
+        else:
+            # Generate an absolute path concat list file for FFmpeg
+            concat_file_path = os.path.join(LOCAL_STORAGE_PATH, f"{job_id}_concat_list.txt")
+            with open(concat_file_path, 'w') as concat_file:
+                for input_file in input_files:
+                    # Write absolute paths to the concat list
+                    concat_file.write(f"file '{os.path.abspath(input_file)}'\n")
 
-        # Use the concat demuxer to concatenate the audio files without re-encoding
-        (
-            ffmpeg.input(concat_file_path, format='concat', safe=0).
-                output(output_path, c='copy').
-                run(overwrite_output=True)
-        )
+            # Use the concat demuxer to concatenate the audio files without re-encoding
+            (
+                ffmpeg.input(concat_file_path, format='concat', safe=0).
+                    output(output_path, c='copy').
+                    run(overwrite_output=True)
+            )
 
-        # Clean up input files
-        for f in input_files:
-            os.remove(f)
+            # Clean up input files
+            for f in input_files:
+                os.remove(f)
             
-        os.remove(concat_file_path)  # Remove the concat list file after the operation
+            os.remove(concat_file_path)  # Remove the concat list file after the operation
 
         print(f"Audio combination successful: {output_path}")
 
@@ -20,7 +20,7 @@ import os
 import subprocess
 import json
 import re
-from services.file_management import download_file
+from services.file_management import download_file, remove_file
 from config import LOCAL_STORAGE_PATH
 
 def get_extension_from_format(format_name):
@@ -162,12 +162,10 @@ def process_ffmpeg_compose(data, job_id):
     
     # Clean up input files
     for input_path in input_paths:
-        if os.path.exists(input_path):
-            os.remove(input_path)
+        remove_file(input_path)
     # Clean up subtitles/filter files
     for subtitles_path in subtitles_paths:
-        if os.path.exists(subtitles_path):
-            os.remove(subtitles_path)
+        remove_file(subtitles_path)
     # Get metadata if requested
     metadata = []
     if data.get("metadata"):
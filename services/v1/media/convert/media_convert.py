@@ -18,7 +18,7 @@ import os
 import ffmpeg
 import subprocess
 import logging
-from services.file_management import download_file
+from services.file_management import download_file, remove_file
 from config import LOCAL_STORAGE_PATH
 
 # Set up logging
@@ -126,20 +126,11 @@ def process_media_convert(media_url, job_id, output_format='mp4', video_codec='l
             # Raise with combined error info for better debugging
             raise Exception(f"{error_msg} - {detailed_error}")
         
-        # Clean up input file if it exists
-        if 'input_filename' in locals() and os.path.exists(input_filename):
-            try:
-                os.remove(input_filename)
-                logger.info(f"Cleaned up input file: {input_filename}")
-            except Exception as cleanup_error:
-                logger.error(f"Failed to clean up input file: {str(cleanup_error)}")
-                
-        # Clean up output file if it exists
-        if 'output_path' in locals() and os.path.exists(output_path):
-            try:
-                os.remove(output_path)
-                logger.info(f"Cleaned up output file: {output_path}")
-            except Exception as cleanup_error:
-                logger.error(f"Failed to clean up output file: {str(cleanup_error)}")
+        # Clean up input and output files if they exist
+        if 'input_filename' in locals():
+            remove_file(input_filename)
+        
+        if 'output_path' in locals():
+            remove_file(output_path)
                 
         raise
\ No newline at end of file
@@ -17,12 +17,13 @@
 
 
 import os
-import whisper
 import srt
 from datetime import timedelta
 from whisper.utils import WriteSRT, WriteVTT
 from services.file_management import download_file
+from services.whisper_models import acquire_whisper_model, release_whisper_model
 import logging
+import orjson
 from config import LOCAL_STORAGE_PATH
 
 # Set up logging
@@ -39,7 +40,7 @@ def process_transcribe_media(media_url, task, include_text, include_srt, include
         # Load a larger model for better translation quality
         #model_size = "large" if task == "translate" else "base"
         model_size = "base"
-        model = whisper.load_model(model_size)
+        model = acquire_whisper_model(model_size)
         logger.info(f"Loaded Whisper {model_size} model")
 
         # Configure transcription/translation options
@@ -53,7 +54,10 @@ def process_transcribe_media(media_url, task, include_text, include_srt, include
         if language:
             options["language"] = language
 
-        result = model.transcribe(input_filename, **options)
+        try:
+            result = model.transcribe(input_filename, **options)
+        finally:
+            release_whisper_model(model, model_size)
         
         # For translation task, the result['text'] will be in English
         text = None
@@ -145,8 +149,8 @@ def process_transcribe_media(media_url, task, include_text, include_srt, include
 
             if include_segments is True:
                 segments_filename = os.path.join(LOCAL_STORAGE_PATH, f"{job_id}.json")
-                with open(segments_filename, 'w') as f:
-                    f.write(str(segments_json))
+                with open(segments_filename, 'wb') as f:
+                    f.write(orjson.dumps(segments_json, option=orjson.OPT_SERIALIZE_NUMPY))
             else:
                 segments_filename = None
 
@@ -21,7 +21,7 @@ import json
 import subprocess
 import logging
 import re
-from services.file_management import download_file
+from services.file_management import download_file, remove_file
 from config import LOCAL_STORAGE_PATH
 
 # Set up logging
@@ -160,8 +160,7 @@ def detect_silence(media_url, start_time=None, end_time=None, noise_threshold="-
     except Exception as e:
         logger.error(f"Silence detection failed: {str(e)}")
         # Make sure to clean up even on error
-        if os.path.exists(input_filename):
-            os.remove(input_filename)
+        remove_file(input_filename)
         raise
 
 def format_time(seconds):
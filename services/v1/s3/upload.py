@@ -23,9 +23,50 @@ import requests
 from urllib.parse import urlparse, unquote, quote
 import uuid
 import re
+import queue
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 
 logger = logging.getLogger(__name__)
 
+# Size of each multipart upload part (AWS minimum is 5MB)
+PART_SIZE = 5 * 1024 * 1024
+
+# Maximum number of idle part buffers kept around for reuse
+MAX_POOLED_BUFFERS = 32
+
+_buffer_pool = queue.LifoQueue()
+
+# Parts uploaded at once for a single file, bounding its memory use to
+# roughly (MAX_PARTS_IN_FLIGHT + 1) * PART_SIZE
+MAX_PARTS_IN_FLIGHT = 4
+
+# Shared pool that runs upload_part calls for all uploads in this process
+part_executor = ThreadPoolExecutor(max_workers=16)
+
+def acquire_buffer():
+    """Take a PART_SIZE bytearray from the pool, allocating one if it is empty."""
+    try:
+        return _buffer_pool.get_nowait()
+    except queue.Empty:
+        return bytearray(PART_SIZE)
+
+def release_buffer(buffer):
+    """Return a buffer to the pool so later uploads can reuse it."""
+    if _buffer_pool.qsize() < MAX_POOLED_BUFFERS:
+        _buffer_pool.put(buffer)
+
+def read_part(stream, buffer):
+    """Fill buffer from stream until it is full or the stream ends; return the bytes read."""
+    view = memoryview(buffer)
+    filled = 0
+    while filled < len(buffer):
+        n = stream.readinto(view[filled:])
+        if not n:
+            break
+        filled += n
+    return filled
+
 def get_s3_client():
     """Create and return an S3 client using environment variables."""
     endpoint_url = os.getenv('S3_ENDPOINT_URL')
@@ -91,54 +132,80 @@ def stream_upload_to_s3(file_url, custom_filename=None, make_public=False, downl
         
         upload_id = multipart_upload['UploadId']
         
-        # Stream the file from URL
-        response = requests.get(file_url, stream=True, headers=download_headers)
-        response.raise_for_status()
-        
-        # Process in chunks using multipart upload
-        chunk_size = 5 * 1024 * 1024  # 5MB chunks (AWS minimum)
+        # Read the body into pooled part buffers while earlier parts upload
+        # in the background, so the download never waits on S3
         parts = []
+        pending = deque()
         part_number = 1
+        response = None
         
-        buffer = bytearray()
+        def finish_oldest_part():
+            number, buffer, future = pending.popleft()
+            etag = future.result()['ETag']
+            if buffer is not None:
+                release_buffer(buffer)
+            parts.append({
+                'PartNumber': number,
+                'ETag': etag
+            })
         
-        for chunk in response.iter_content(chunk_size=1024 * 1024):  # 1MB read chunks
-            buffer.extend(chunk)
+        try:
+            # Stream the file from URL
+            response = requests.get(file_url, stream=True, headers=download_headers)
+            response.raise_for_status()
+            
+            # Let urllib3 undo any gzip/deflate transfer encoding while reading
+            response.raw.decode_content = True
             
-            # When we have enough data for a part, upload it
-            if len(buffer) >= chunk_size:
+            while True:
+                buffer = acquire_buffer()
+                size = read_part(response.raw, buffer)
+                if not size:
+                    release_buffer(buffer)
+                    break
+                
+                if size < PART_SIZE:
+                    # Copy the short final part so its buffer can go straight back
+                    body = bytes(buffer[:size])
+                    release_buffer(buffer)
+                    buffer = None
+                else:
+                    body = buffer
+                
                 logger.info(f"Uploading part {part_number}")
-                part = s3_client.upload_part(
+                future = part_executor.submit(
+                    s3_client.upload_part,
                     Bucket=bucket_name,
                     Key=filename,
                     PartNumber=part_number,
                     UploadId=upload_id,
-                    Body=buffer
+                    Body=body
                 )
+                pending.append((part_number, buffer, future))
+                part_number += 1
                 
-                parts.append({
-                    'PartNumber': part_number,
-                    'ETag': part['ETag']
-                })
+                # Wait for the oldest part before reading more than the in-flight limit
+                if len(pending) >= MAX_PARTS_IN_FLIGHT:
+                    finish_oldest_part()
                 
-                part_number += 1
-                buffer = bytearray()
-        
-        # Upload any remaining data as the final part
-        if buffer:
-            logger.info(f"Uploading final part {part_number}")
-            part = s3_client.upload_part(
-                Bucket=bucket_name,
-                Key=filename,
-                PartNumber=part_number,
-                UploadId=upload_id,
-                Body=buffer
-            )
+                if size < PART_SIZE:
+                    break
             
-            parts.append({
-                'PartNumber': part_number,
-                'ETag': part['ETag']
-            })
+            while pending:
+                finish_oldest_part()
+        except Exception:
+            # Let in-flight parts settle, then discard the partial upload so
+            # its parts don't linger (and get billed) in the bucket
+            for _, _, future in pending:
+                future.exception()
+            try:
+                s3_client.abort_multipart_upload(Bucket=bucket_name, Key=filename, UploadId=upload_id)
+            except Exception as abort_error:
+                logger.warning(f"Failed to abort multipart upload {upload_id}: {abort_error}")
+            raise
+        finally:
+            if response is not None:
+                response.close()
         
         # Complete the multipart upload
         logger.info("Completing multipart upload")
@@ -22,7 +22,7 @@ import subprocess
 import logging
 import uuid
 import tempfile
-from services.file_management import download_file
+from services.file_management import download_file, remove_file
 from services.cloud_storage import upload_file
 from config import LOCAL_STORAGE_PATH
 
@@ -257,8 +257,7 @@ def cut_media(video_url, cuts, job_id=None, video_codec='libx264', video_preset=
         
         # Clean up temporary files
         for temp_file in temp_files:
-            if os.path.exists(temp_file):
-                os.remove(temp_file)
+            if remove_file(temp_file):
                 logger.info(f"Removed temporary file: {temp_file}")
         
         return output_filename, input_filename
@@ -267,13 +266,12 @@ def cut_media(video_url, cuts, job_id=None, video_codec='libx264', video_preset=
         logger.error(f"Video cut operation failed: {str(e)}")
         # Clean up all temporary files if they exist
         for temp_file in temp_files:
-            if os.path.exists(temp_file):
-                os.remove(temp_file)
+            remove_file(temp_file)
                 
-        if 'input_filename' in locals() and os.path.exists(input_filename):
-            os.remove(input_filename)
+        if 'input_filename' in locals():
+            remove_file(input_filename)
                     
-        if 'output_filename' in locals() and os.path.exists(output_filename):
-            os.remove(output_filename)
+        if 'output_filename' in locals():
+            remove_file(output_filename)
             
         raise
\ No newline at end of file
@@ -21,7 +21,7 @@ import json
 import subprocess
 import logging
 import uuid
-from services.file_management import download_file
+from services.file_management import download_file, remove_file
 from services.cloud_storage import upload_file
 from config import LOCAL_STORAGE_PATH
 
@@ -171,11 +171,10 @@ def split_video(video_url, splits, job_id=None, video_codec='libx264', video_pre
         logger.error(f"Video split operation failed: {str(e)}")
         
         # Clean up all temporary files if they exist
-        if 'input_filename' in locals() and os.path.exists(input_filename):
-            os.remove(input_filename)
+        if 'input_filename' in locals():
+            remove_file(input_filename)
                 
         for output_file in output_files:
-            if os.path.exists(output_file):
-                os.remove(output_file)
+            remove_file(output_file)
                 
         raise
\ No newline at end of file
@@ -18,6 +18,7 @@
 
 import os
 import ffmpeg
+from services.file_management import remove_file
 from config import LOCAL_STORAGE_PATH
 
 def extract_thumbnail(video_url, job_id, second=0):
@@ -56,6 +57,5 @@ def extract_thumbnail(video_url, job_id, second=0):
     except Exception as e:
         print(f"Thumbnail extraction failed: {str(e)}")
         # Clean up partial thumbnail file on error
-        if os.path.exists(thumbnail_path):
-            os.remove(thumbnail_path)
+        remove_file(thumbnail_path)
         raise
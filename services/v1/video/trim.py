@@ -21,7 +21,7 @@ import json
 import subprocess
 import logging
 import uuid
-from services.file_management import download_file
+from services.file_management import download_file, remove_file
 from services.cloud_storage import upload_file
 from config import LOCAL_STORAGE_PATH
 
@@ -169,10 +169,10 @@ def trim_video(video_url, start=None, end=None, job_id=None, video_codec='libx26
         logger.error(f"Video trim operation failed: {str(e)}")
         
         # Clean up all temporary files if they exist
-        if 'input_filename' in locals() and os.path.exists(input_filename):
-            os.remove(input_filename)
+        if 'input_filename' in locals():
+            remove_file(input_filename)
                 
-        if 'output_filename' in locals() and os.path.exists(output_filename):
-            os.remove(output_filename)
+        if 'output_filename' in locals():
+            remove_file(output_filename)
             
         raise
\ No newline at end of file
@@ -17,15 +17,24 @@
 
 
 import requests
+import http.cookiejar
 import logging
+from requests.adapters import HTTPAdapter
 
 logger = logging.getLogger(__name__)
 
+# Shared session so webhooks to the same host reuse keep-alive connections
+session = requests.Session()
+session.mount('http://', HTTPAdapter(pool_connections=10, pool_maxsize=10))
+session.mount('https://', HTTPAdapter(pool_connections=10, pool_maxsize=10))
+# Don't carry cookies set by one webhook endpoint over to other jobs' webhooks
+session.cookies.set_policy(http.cookiejar.DefaultCookiePolicy(allowed_domains=[]))
+
 def send_webhook(webhook_url, data):
     """Send a POST request to a webhook URL with the provided data."""
     try:
         logger.info(f"Attempting to send webhook to {webhook_url} with data: {data}")
-        response = requests.post(webhook_url, json=data)
+        response = session.post(webhook_url, json=data)
         response.raise_for_status()
         logger.info(f"Webhook sent: {data}")
     except requests.RequestException as e:
@@ -0,0 +1,68 @@
+# Copyright (c) 2025 Stephen G. Pope
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along
+# with this program; if not, write to the Free Software Foundation, Inc.,
+# 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+
+
+
+import os
+import queue
+import logging
+import threading
+import whisper
+
+logger = logging.getLogger(__name__)
+
+# Whisper installs decoding hooks on the model while it transcribes, so a loaded
+# model is checked out by one job at a time. At most this many models of each
+# size are kept in memory; further jobs wait for one to be returned.
+WHISPER_POOL_SIZE = max(1, int(os.environ.get('WHISPER_POOL_SIZE', 1)))
+
+_pools = {}
+_loaded = {}
+_lock = threading.Lock()
+
+def acquire_whisper_model(model_size="base"):
+    """Check out a Whisper model of the given size, loading one if the pool isn't full.
+
+    Every model must be handed back with release_whisper_model, normally in a finally block.
+    """
+    while True:
+        with _lock:
+            pool = _pools.setdefault(model_size, queue.Queue())
+            try:
+                return pool.get_nowait()
+            except queue.Empty:
+                pass
+            if _loaded.get(model_size, 0) < WHISPER_POOL_SIZE:
+                _loaded[model_size] = _loaded.get(model_size, 0) + 1
+                break
+
+        # Re-check periodically in case a load that was in flight failed
+        try:
+            return pool.get(timeout=1)
+        except queue.Empty:
+            pass
+
+    try:
+        logger.info(f"Loading Whisper {model_size} model")
+        return whisper.load_model(model_size)
+    except Exception:
+        with _lock:
+            _loaded[model_size] -= 1
+        raise
+
+def release_whisper_model(model, model_size="base"):
+    """Return a model obtained from acquire_whisper_model to the pool."""
+    _pools[model_size].put(model)